@@ -6,8 +6,15 @@ from typing import Optional
 from dataclasses import dataclass
 
 import cv2
+import numpy as np
+from turbojpeg import TurboJPEG, TJFLAG_FASTDCT, TJPF_BGR, TJSAMP_420
 
 
+# Number of preallocated capture buffers per camera. The encoder copies a
+# frame out (while rotating it) right after picking it up, so the capture
+# thread can cycle through a small ring without overwriting a frame in use.
+CAPTURE_RING_SIZE = 3
+
 # Debug: directory for saving images
 DEBUG_IMAGE_DIR = Path(__file__).parent.parent.parent.parent / "data" / "images"
 
@@ -20,6 +27,8 @@ class CameraConfig:
     height: int = 480
     fps: int = 30
     jpeg_quality: int = 85
+    fourcc: Optional[str] = "MJPG"  # None keeps the driver's default pixel format
+    jpeg_encode: bool = True  # False leaves get_image() empty; consumers encode raw frames on demand
 
 
 class CameraService:
@@ -27,8 +36,10 @@ class CameraService:
     Service for capturing images from one or more cameras.
     
     Each camera runs in its own background thread, continuously capturing
-    frames and encoding them as JPEG. The latest frame for each camera
-    is stored and can be retrieved instantly via get_image().
+    frames at the camera's native cadence. A per-camera encoder thread picks
+    up the latest captured frame and encodes it as JPEG, so capture
+    and encode overlap. The latest frame for each camera is stored and can
+    be retrieved instantly via get_image().
     
     Usage:
         camera_config = {
@@ -38,8 +49,9 @@ class CameraService:
         service = CameraService(camera_config)
         service.start()
         
-        # Get latest frame as JPEG bytes
-        image_bytes = service.get_image("front")
+        # Get latest frame as a JPEG buffer (or a bytes copy)
+        image = service.get_image("front")
+        image_bytes = service.get_image_bytes("front")
         
         service.stop()
     """
@@ -55,11 +67,29 @@ class CameraService:
         self.cameras = cameras
         self.logger = logging.getLogger("service.cameras")
         
+        # libjpeg-turbo encoder, shared by all encoder workers (encode is thread-safe)
+        self._tj = TurboJPEG()
+        
         # Per-camera state
         self._captures: dict[str, cv2.VideoCapture] = {}
         self._threads: dict[str, threading.Thread] = {}
-        self._frames: dict[str, Optional[bytes]] = {}
-        self._frame_locks: dict[str, threading.Lock] = {}
+        self._encode_threads: dict[str, threading.Thread] = {}
+        # Size-1 hand-off slot from capture to encoder. The capture thread
+        # overwrites it (drop-on-full) and the encoder pops it, so the encoder
+        # only ever sees the newest frame.
+        self._raw_slots: dict[str, np.ndarray] = {}
+        self._raw_ready: dict[str, threading.Event] = {}
+        # Latest frame per camera. Each encoder worker is the only writer of its
+        # slot and replaces the reference in one assignment, so readers never
+        # need a lock to get a consistent frame.
+        self._frames: dict[str, Optional[memoryview]] = {}
+        # Latest rotated BGR frame per camera, published the same way, with a
+        # monotonically increasing index so consumers can tell frames apart
+        self._raw_frames: dict[str, Optional[np.ndarray]] = {}
+        self._frame_indices: dict[str, int] = {}
+        # Ping-pong JPEG output buffers. Published frames are views into them,
+        # so a reader of the previous frame never races with the next encode.
+        self._encode_buffers: dict[str, list[bytearray]] = {}
         
         # Global state
         self._running = threading.Event()
@@ -75,9 +105,15 @@ class CameraService:
         for label, config in self.cameras.items():
             # Initialize capture
             cap = cv2.VideoCapture(config.device_id)
+            if config.fourcc:
+                # Compressed USB transfer; must be set before the resolution
+                cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*config.fourcc))
             cap.set(cv2.CAP_PROP_FRAME_WIDTH, config.width)
             cap.set(cv2.CAP_PROP_FRAME_HEIGHT, config.height)
             cap.set(cv2.CAP_PROP_FPS, config.fps)
+            # Keep a single driver buffer so a slow loop reads the newest frame
+            # instead of working through a queue of stale ones
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
             
             if not cap.isOpened():
                 self.logger.error(f"Failed to open camera '{label}' (device {config.device_id})")
@@ -85,9 +121,19 @@ class CameraService:
             
             self._captures[label] = cap
             self._frames[label] = None
-            self._frame_locks[label] = threading.Lock()
+            self._raw_frames[label] = None
+            self._frame_indices[label] = 0
+            self._raw_ready[label] = threading.Event()
             
-            # Start capture thread
+            # Start encoder and capture threads
+            encode_thread = threading.Thread(
+                target=self._encode_loop,
+                args=(label, config),
+                daemon=True,
+                name=f"camera-encoder-{label}"
+            )
+            self._encode_threads[label] = encode_thread
+            encode_thread.start()
             thread = threading.Thread(
                 target=self._capture_loop,
                 args=(label, config),
@@ -110,12 +156,12 @@ class CameraService:
         self.logger.info("Stopping camera service...")
         self._running.clear()
         
-        # Wait for threads to finish
-        for label, thread in self._threads.items():
+        # Wait for threads to finish; encoders exit on their next wake-up
+        for label, thread in [*self._threads.items(), *self._encode_threads.items()]:
             if thread.is_alive():
                 thread.join(timeout=timeout)
                 if thread.is_alive():
-                    self.logger.warning(f"Camera thread '{label}' did not stop within timeout")
+                    self.logger.warning(f"Camera thread '{thread.name}' did not stop within timeout")
         
         # Release captures
         for label, cap in self._captures.items():
@@ -125,54 +171,121 @@ class CameraService:
         # Clear state
         self._captures.clear()
         self._threads.clear()
+        self._encode_threads.clear()
+        self._raw_slots.clear()
+        self._raw_ready.clear()
         self._frames.clear()
-        self._frame_locks.clear()
+        self._raw_frames.clear()
+        self._frame_indices.clear()
+        self._encode_buffers.clear()
         
         self.logger.info("Camera service stopped")
     
     def _capture_loop(self, label: str, config: CameraConfig) -> None:
         """Background thread that continuously captures frames from a camera."""
         cap = self._captures[label]
-        encode_params = [cv2.IMWRITE_JPEG_QUALITY, config.jpeg_quality]
+        ready = self._raw_ready[label]
+        
+        # Decode straight into preallocated buffers instead of a fresh array
+        # per frame. OpenCV reallocates if the driver delivers another size,
+        # in which case the returned array takes over the ring slot.
+        ring = [
+            np.empty((config.height, config.width, 3), dtype=np.uint8)
+            for _ in range(CAPTURE_RING_SIZE)
+        ]
+        ring_index = 0
         
         while self._running.is_set():
-            ret, frame = cap.read()
+            ret, frame = cap.read(ring[ring_index])
             
             if not ret:
                 self.logger.warning(f"Failed to read frame from camera '{label}'")
                 continue
             
-            # Rotate 180 degrees (camera is mounted upside down)
-            frame = cv2.rotate(frame, cv2.ROTATE_180)
+            ring[ring_index] = frame
+            ring_index = (ring_index + 1) % CAPTURE_RING_SIZE
             
-            # Encode as JPEG
-            success, jpeg_bytes = cv2.imencode('.jpg', frame, encode_params)
+            # Hand the frame to the encoder, replacing any frame it has not
+            # picked up yet
+            self._raw_slots[label] = frame
+            ready.set()
+    
+    def _encode_loop(self, label: str, config: CameraConfig) -> None:
+        """Background thread that JPEG-encodes the latest frame of a camera."""
+        ready = self._raw_ready[label]
+        buffer_index = 0
+        rotated: list[np.ndarray] = []
+        rotated_index = 0
+        
+        while self._running.is_set():
+            if not ready.wait(timeout=0.1):
+                continue
+            ready.clear()
+            frame = self._raw_slots.pop(label, None)
+            if frame is None:
+                continue
+            
+            # Rotate 180 degrees (camera is mounted upside down) into reused
+            # ping-pong buffers owned by this worker, so the frame handed out by
+            # get_raw_frame() stays intact while the next one is rotated
+            if not rotated or rotated[0].shape != frame.shape:
+                rotated = [np.empty_like(frame), np.empty_like(frame)]
+            frame = cv2.rotate(frame, cv2.ROTATE_180, dst=rotated[rotated_index])
+            rotated_index ^= 1
+            self._raw_frames[label] = frame
+            self._frame_indices[label] += 1
             
-            if not success:
-                self.logger.warning(f"Failed to encode frame from camera '{label}'")
+            # Consumers of this camera encode from get_raw_frame() themselves
+            if not config.jpeg_encode:
                 continue
             
-            # Store the latest frame
-            with self._frame_locks[label]:
-                self._frames[label] = jpeg_bytes.tobytes()
+            # Size the output buffers from the first frame (the camera may not
+            # honour the requested resolution)
+            buffers = self._encode_buffers.get(label)
+            buffer_size = self._tj.buffer_size(frame, TJSAMP_420)
+            if buffers is None or len(buffers[0]) != buffer_size:
+                buffers = [bytearray(buffer_size), bytearray(buffer_size)]
+                self._encode_buffers[label] = buffers
+            
+            # Encode as JPEG in place (libjpeg-turbo SIMD path)
+            buffer = buffers[buffer_index]
+            try:
+                _, jpeg_size = self._tj.encode(
+                    frame,
+                    quality=config.jpeg_quality,
+                    pixel_format=TJPF_BGR,
+                    jpeg_subsample=TJSAMP_420,
+                    flags=TJFLAG_FASTDCT,
+                    dst=buffer,
+                )
+            except OSError as e:
+                self.logger.warning(f"Failed to encode frame from camera '{label}': {e}")
+                continue
+            buffer_index ^= 1
+            
+            # Publish the latest frame as a view, without copying
+            self._frames[label] = memoryview(buffer)[:jpeg_size]
     
-    def get_image(self, label: str) -> Optional[bytes]:
+    def get_image(self, label: str) -> Optional[memoryview]:
         """
-        Get the latest image from a camera as JPEG bytes.
+        Get the latest image from a camera as a JPEG buffer.
+        
+        The memoryview points into the encoder's output buffer and is
+        overwritten two frames later. Use it right away (base64, ZMQ send,
+        file write all accept buffers) or call get_image_bytes() for a copy.
         
         Args:
             label: The camera label (e.g., "front", "side")
         
         Returns:
-            JPEG-encoded image bytes, or None if no frame is available
-            or the camera doesn't exist.
+            JPEG-encoded image buffer, or None if no frame is available,
+            the camera doesn't exist or its jpeg_encode is off.
         """
-        if label not in self._frame_locks:
+        if label not in self._frames:
             self.logger.warning(f"Camera '{label}' not found")
             return None
         
-        with self._frame_locks[label]:
-            image_bytes = self._frames[label]
+        image_bytes = self._frames.get(label)
         
         # # Debug: save image to disk
         # if image_bytes:
@@ -184,12 +297,63 @@ class CameraService:
         
         return image_bytes
     
-    def get_all_images(self) -> dict[str, Optional[bytes]]:
+    def get_image_bytes(self, label: str) -> Optional[bytes]:
+        """
+        Get the latest image from a camera as a JPEG bytes copy.
+        
+        Args:
+            label: The camera label (e.g., "front", "side")
+        
+        Returns:
+            JPEG-encoded image bytes, or None if no frame is available
+            or the camera doesn't exist.
+        """
+        image = self.get_image(label)
+        return bytes(image) if image is not None else None
+    
+    def get_raw_frame(self, label: str) -> Optional[np.ndarray]:
+        """
+        Get the latest frame from a camera as a BGR array, before JPEG encoding.
+        
+        The array is shared with the capture pipeline rather than copied and
+        is overwritten two frames later; copy it if it has to be kept longer.
+        
+        Args:
+            label: The camera label (e.g., "front", "side")
+        
+        Returns:
+            BGR image array of shape (height, width, 3), or None if no frame
+            is available or the camera doesn't exist.
+        """
+        if label not in self._raw_frames:
+            self.logger.warning(f"Camera '{label}' not found")
+            return None
+        
+        return self._raw_frames.get(label)
+    
+    def get_frame_index(self, label: str) -> int:
+        """
+        Get the index of the latest raw frame from a camera.
+        
+        The index increases by one for every frame published, so a consumer
+        can skip work when it has already seen the current frame.
+        
+        Args:
+            label: The camera label (e.g., "front", "side")
+        
+        Returns:
+            Frame index, or 0 if no frame has been captured yet or the camera
+            doesn't exist.
+        """
+        return self._frame_indices.get(label, 0)
+    
+    def get_all_images(self) -> dict[str, Optional[memoryview]]:
         """
         Get the latest images from all cameras.
         
         Returns:
-            Dict mapping camera labels to their latest JPEG bytes.
+            Dict mapping camera labels to their latest JPEG buffers
+            (see get_image() for their lifetime).
         """
         result = {}
         for label in self._frames.keys():
@@ -225,17 +225,16 @@ class ArmsService:
             return None
 
         try:
-            with open(csv_path, "r") as csvfile:
-                csv_reader = csv.DictReader(csvfile)
-                actions = []
-                for row in csv_reader:
-                    # Extract action data (exclude timestamp column)
-                    action = {
-                        key: float(value)
-                        for key, value in row.items()
-                        if key != "timestamp"
-                    }
-                    actions.append(action)
+            with open(csv_path, "r", newline="") as csvfile:
+                csv_reader = csv.reader(csvfile)
+                header = next(csv_reader)
+                # Action columns by position (exclude timestamp column)
+                columns = [i for i, key in enumerate(header) if key != "timestamp"]
+                keys = [header[i] for i in columns]
+                actions = [
+                    dict(zip(keys, [float(row[i]) for i in columns]))
+                    for row in csv_reader
+                ]
 
             # Cache the recording
             self._recording_cache[recording_name] = actions
@@ -59,21 +59,24 @@ class WheelsService(ServiceBase):
             return
 
         try:
-            with open(csv_path, "r") as csvfile:
-                csv_reader = csv.DictReader(csvfile)
-                actions = list(csv_reader)
+            with open(csv_path, "r", newline="") as csvfile:
+                csv_reader = csv.reader(csvfile)
+                header = next(csv_reader)
+                # Wheel velocity columns by position (exclude timestamp column)
+                columns = [i for i, key in enumerate(header) if key != "timestamp"]
+                keys = [header[i] for i in columns]
+                actions = [[float(row[i]) for i in columns] for row in csv_reader]
 
             self.logger.info(f"Playing {len(actions)} actions from {recording_name}")
 
-            for row in actions:
+            # One dict reused for every frame; send_base_action reads it and
+            # keeps no reference
+            base_action = dict.fromkeys(keys, 0.0)
+
+            for values in actions:
                 t0 = time.perf_counter()
 
-                # Extract wheel velocity data (exclude timestamp column)
-                base_action = {
-                    key: float(value)
-                    for key, value in row.items()
-                    if key != "timestamp"
-                }
+                base_action.update(zip(keys, values))
                 
                 # Send only base velocities using dedicated method
                 self.robot.send_base_action(base_action)
@@ -1,9 +1,14 @@
+import argparse
 import logging
 import os
 from pathlib import Path
+import sys
 import time
-import configparser
+from typing import Optional
+from dataclasses import asdict, dataclass, fields, replace
+from functools import lru_cache
 
+import orjson
 from dotenv import load_dotenv
 from livekit import rtc, agents
 from livekit.agents import (
@@ -24,68 +29,91 @@ from livekit.plugins import (
 from lekiwi.services import Priority
 from lekiwi.services.motors import ArmsService, WheelsService
 from lekiwi.services.cameras import CameraService, CameraConfig
-import base64
+import pybase64
+from turbojpeg import TurboJPEG, TJFLAG_FASTDCT, TJPF_BGR, TJSAMP_420
 import zmq
 
 load_dotenv()
 
+# uvloop's event loop is considerably faster than the stdlib selector loop for the
+# socket-heavy LiveKit session; installed at import so job processes pick it up too
+if sys.platform != "win32":
+    import uvloop
 
+    uvloop.install()
+
+logger = logging.getLogger("lekiwi.agent")
+
+_PERSONALITY_DIR = Path(__file__).parent / "lekiwi" / "personality"
+_SYSTEM_PROMPT_PATH = _PERSONALITY_DIR / "system.txt"
+_PERSONA_CONFIG_PATH = _PERSONALITY_DIR / "persona.json"
+
+# JPEG encoder for the per-turn camera image. The VLM only sees one frame per user
+# turn, so the front camera skips continuous encoding and the frame is encoded here.
+_TJ = TurboJPEG()
+_VLM_JPEG_QUALITY = 70
+
+
+@lru_cache(maxsize=1)
 def _load_system_prompt() -> str:
     """Load the system prompt from the personality/system.txt file."""
-    current_dir = Path(__file__).parent
-    system_prompt_path = current_dir / "lekiwi" / "personality" / "system.txt"
-
     try:
-        with open(system_prompt_path, "r", encoding="utf-8") as f:
-            return f.read().strip()
+        return _SYSTEM_PROMPT_PATH.read_text(encoding="utf-8").strip()
     except FileNotFoundError:
         raise FileNotFoundError(
-            f"System prompt file not found at {system_prompt_path}. "
+            f"System prompt file not found at {_SYSTEM_PROMPT_PATH}. "
             "Please ensure the file exists."
         )
 
 
-def _get_persona_config_path() -> Path:
-    """Get the path to the persona.ini configuration file."""
-    return Path(__file__).parent / "lekiwi" / "personality" / "persona.ini"
+@dataclass(slots=True, frozen=True)
+class Persona:
+    """Personality parameters, each a percentage from 0 to 100."""
+    honesty: int
+    humor: int
+    empathy: int
+    sarcasm: int
+    verbosity: int
 
 
-def _load_persona_config() -> dict[str, int]:
-    """Load personality configuration from persona.ini."""
-    config = configparser.ConfigParser()
-    config.read(_get_persona_config_path())
+_PERSONA_PARAMETERS = tuple(field.name for field in fields(Persona))
 
-    return {
-        "honesty": config.getint("personality", "honesty"),
-        "humor": config.getint("personality", "humor"),
-        "empathy": config.getint("personality", "empathy"),
-        "sarcasm": config.getint("personality", "sarcasm"),
-        "verbosity": config.getint("personality", "verbosity"),
-    }
 
+# Loaded persona and its formatted prompt text, filled lazily and replaced on update
+_PERSONA_CACHE: Optional[tuple[Persona, str]] = None
 
-def _update_persona_config(parameter: str, value: int) -> dict[str, int]:
-    """Update a personality parameter in persona.ini and return updated config."""
-    config = configparser.ConfigParser()
-    config_path = _get_persona_config_path()
-    config.read(config_path)
 
-    config.set("personality", parameter, str(value))
+def _load_persona_config() -> tuple[Persona, str]:
+    """Load personality configuration from persona.json along with its prompt text."""
+    global _PERSONA_CACHE
+    if _PERSONA_CACHE is None:
+        persona = Persona(**orjson.loads(_PERSONA_CONFIG_PATH.read_bytes()))
+        _PERSONA_CACHE = (persona, _format_persona_config(persona))
+    return _PERSONA_CACHE
 
-    with open(config_path, "w") as f:
-        config.write(f)
 
-    return _load_persona_config()
+def _update_persona_config(parameter: str, value: int) -> tuple[Persona, str]:
+    """Update a personality parameter in persona.json and return updated config."""
+    global _PERSONA_CACHE
+    persona, _ = _load_persona_config()
+    updated = replace(persona, **{parameter: value})
+
+    _PERSONA_CONFIG_PATH.write_bytes(
+        orjson.dumps(asdict(updated), option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    )
+
+    _PERSONA_CACHE = (updated, _format_persona_config(updated))
+    return _PERSONA_CACHE
 
 
-def _format_persona_config(config: dict[str, int]) -> str:
+def _format_persona_config(config: Persona) -> str:
     """Format personality configuration for prompt injection."""
     return f"""CURRENT PERSONALITY CONFIGURATION:
-- Honesty: {config['honesty']}%
-- Humor: {config['humor']}%
-- Empathy: {config['empathy']}%
-- Sarcasm: {config['sarcasm']}%
-- Verbosity: {config['verbosity']}%"""
+- Honesty: {config.honesty}%
+- Humor: {config.humor}%
+- Empathy: {config.empathy}%
+- Sarcasm: {config.sarcasm}%
+- Verbosity: {config.verbosity}%"""
 
 
 class LeKiwi(Agent):
@@ -102,7 +130,7 @@ class LeKiwi(Agent):
         
         # Camera configuration
         camera_config = {
-            "front": CameraConfig(device_id=0, width=640, height=480),
+            "front": CameraConfig(device_id=0, width=640, height=480, jpeg_encode=False),
         }
         self.camera_service = CameraService(camera_config)
 
@@ -110,16 +138,42 @@ class LeKiwi(Agent):
         self.arms_service.start()
         self.camera_service.start()
 
+        # Recording names per service and name -> service that plays it, so lookups
+        # in the tool handlers are O(1)
+        self._arm_recordings: frozenset[str] = frozenset()
+        self._wheel_recordings: frozenset[str] = frozenset()
+        self._recording_index: dict[str, ArmsService | WheelsService] = {}
+        self._refresh_recording_index()
+
         # Wake up
         self.arms_service.dispatch("play", "wake_up")
         
+    def _refresh_recording_index(self) -> None:
+        """Rebuild the recording sets and name -> service index from both services."""
+        self._arm_recordings = frozenset(self.arms_service.get_available_recordings())
+        self._wheel_recordings = frozenset(self.wheels_service.get_available_recordings())
+        # Arm recordings win on a name clash, matching the lookup order play_recording always had
+        index: dict[str, ArmsService | WheelsService] = dict.fromkeys(
+            self._wheel_recordings, self.wheels_service
+        )
+        index.update(dict.fromkeys(self._arm_recordings, self.arms_service))
+        self._recording_index = index
+
     async def on_user_turn_completed(self, turn_ctx: ChatContext, new_message: ChatMessage) -> None:
         """Overwrite on_user_turn_completed and inject a camera image into a user message before the VLM processes it."""
-        image_bytes = self.camera_service.get_image("front")
-
-        if image_bytes:
-            # Convert JPEG bytes to PIL Image
-            image_content = ImageContent(image=f"data:image/jpeg;base64,{base64.b64encode(image_bytes).decode('utf-8')}")
+        frame = self.camera_service.get_raw_frame("front")
+
+        if frame is not None:
+            image_bytes = _TJ.encode(
+                frame,
+                quality=_VLM_JPEG_QUALITY,
+                pixel_format=TJPF_BGR,
+                jpeg_subsample=TJSAMP_420,
+                flags=TJFLAG_FASTDCT,
+            )
+            # ImageContent takes a URL string or an rtc.VideoFrame, so the JPEG goes in as a
+            # data URL; pybase64 does the encode with SIMD straight to str
+            image_content = ImageContent(image=f"data:image/jpeg;base64,{pybase64.b64encode_as_string(image_bytes)}")
             new_message.content.append(image_content)
 
     @function_tool
@@ -134,19 +188,17 @@ class LeKiwi(Agent):
         Returns:
             List of available physical expression recordings you can perform.
         """
-        print("LeKiwi: get_available_recordings function called")
+        logger.debug("get_available_recordings called")
         try:
+            # Discovery is the natural point to pick up recordings added on disk
+            self._refresh_recording_index()
             all_recordings = []
             
-            if hasattr(self, 'arms_service') and self.arms_service is not None:
-                arm_recordings = self.arms_service.get_available_recordings()
-                if arm_recordings:
-                    all_recordings.append(f"Arm: {', '.join(arm_recordings)}")
+            if self._arm_recordings:
+                all_recordings.append(f"Arm: {', '.join(sorted(self._arm_recordings))}")
             
-            if hasattr(self, 'wheels_service') and self.wheels_service is not None:
-                wheel_recordings = self.wheels_service.get_available_recordings()
-                if wheel_recordings:
-                    all_recordings.append(f"Wheels: {', '.join(wheel_recordings)}")
+            if self._wheel_recordings:
+                all_recordings.append(f"Wheels: {', '.join(sorted(self._wheel_recordings))}")
 
             if all_recordings:
                 return "Available recordings - " + "; ".join(all_recordings)
@@ -168,24 +220,19 @@ class LeKiwi(Agent):
         Args:
             recording_name: Name of the physical expression to perform (use get_available_recordings first)
         """
-        print(
-            f"LeKiwi: play_recording function called with recording_name: {recording_name}"
-        )
+        logger.debug("play_recording called with recording_name=%s", recording_name)
         try:
-            # Check which service has this recording and dispatch accordingly
-            if hasattr(self, 'arms_service') and self.arms_service is not None:
-                arm_recordings = self.arms_service.get_available_recordings()
-                if recording_name in arm_recordings:
-                    self.arms_service.dispatch("play", recording_name)
-                    return f"Started playing arm recording: {recording_name}"
-            
-            if hasattr(self, 'wheels_service') and self.wheels_service is not None:
-                wheel_recordings = self.wheels_service.get_available_recordings()
-                if recording_name in wheel_recordings:
-                    self.wheels_service.dispatch("play", recording_name)
-                    return f"Started playing wheels recording: {recording_name}"
-            
-            return f"Recording '{recording_name}' not found in arms or wheels recordings."
+            service = self._recording_index.get(recording_name)
+            if service is None:
+                # The recording may have been added since the index was built
+                self._refresh_recording_index()
+                service = self._recording_index.get(recording_name)
+            if service is None:
+                return f"Recording '{recording_name}' not found in arms or wheels recordings."
+
+            service.dispatch("play", recording_name)
+            kind = "arm" if recording_name in self._arm_recordings else "wheels"
+            return f"Started playing {kind} recording: {recording_name}"
         except Exception as e:
             result = f"Error playing recording {recording_name}: {str(e)}"
             return result
@@ -199,8 +246,8 @@ class LeKiwi(Agent):
         Returns:
             Current personality configuration with all parameter values.
         """
-        config = _load_persona_config()
-        return _format_persona_config(config)
+        _, config_text = _load_persona_config()
+        return config_text
 
     @function_tool
     async def update_configuration(self, parameter: str, value: int) -> str:
@@ -214,45 +261,61 @@ class LeKiwi(Agent):
         Returns:
             Updated personality configuration.
         """
-        valid_parameters = ["honesty", "humor", "empathy", "sarcasm", "verbosity"]
-
-        if parameter not in valid_parameters:
-            return f"Invalid parameter '{parameter}'. Valid options: {', '.join(valid_parameters)}"
+        if parameter not in _PERSONA_PARAMETERS:
+            return f"Invalid parameter '{parameter}'. Valid options: {', '.join(_PERSONA_PARAMETERS)}"
 
         if not 0 <= value <= 100:
             return "Value must be between 0 and 100"
 
-        updated_config = _update_persona_config(parameter, value)
-        return _format_persona_config(updated_config)
+        _, config_text = _update_persona_config(parameter, value)
+        return config_text
 
 
-# Entry to the agent
-async def entrypoint(ctx: agents.JobContext):
-    # Parse command-line args to get stream settings
-    import sys
+def _parse_args() -> argparse.Namespace:
+    """Parse the runtime flags, leaving the rest of argv to the LiveKit CLI."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--stream", action="store_true", help="Enable data streaming for visualization"
+    )
+    parser.add_argument(
+        "--stream-port", type=int, default=5556, help="Port for ZMQ data streaming"
+    )
+    args, _ = parser.parse_known_args()
+    return args
 
-    stream_enabled = "--stream" in sys.argv
-    stream_port = 5556
-    for i, arg in enumerate(sys.argv):
-        if arg == "--stream-port" and i + 1 < len(sys.argv):
-            stream_port = int(sys.argv[i + 1])
 
-    agent = LeKiwi(stream_data=stream_enabled, stream_port=stream_port)
+# Parsed once at import, so job processes (which import this module rather than
+# run it as __main__) see the same flags
+_ARGS = _parse_args()
+
+
+# Load the VAD model when the job process starts, so idle processes have it
+# ready before a job is assigned instead of loading it on the first turn
+def prewarm(proc: agents.JobProcess):
+    proc.userdata["vad"] = silero.VAD.load(
+        min_speech_duration=0.5,      # Require 500ms of continuous speech
+        min_silence_duration=1.0,     # Require 1 second of silence to detect turn end
+        activation_threshold=0.8,     # Very high threshold - ignore most sounds
+    )  # Voice Activity Detection - tuned to prevent interruption
+
+
+# Entry to the agent
+async def entrypoint(ctx: agents.JobContext):
+    logging.basicConfig(level=logging.INFO)
+    agent = LeKiwi(stream_data=_ARGS.stream, stream_port=_ARGS.stream_port)
 
     session = AgentSession(
-        vad=silero.VAD.load(
-            min_speech_duration=0.5,      # Require 500ms of continuous speech
-            min_silence_duration=1.0,     # Require 1 second of silence to detect turn end
-            activation_threshold=0.8,     # Very high threshold - ignore most sounds
-        ),  # Voice Activity Detection - tuned to prevent interruption
+        vad=ctx.proc.userdata["vad"],  # Loaded in prewarm()
         stt=cartesia.STT(),      # Or deepgram.STT() for faster/cheaper option
         llm=openai.LLM(model="gpt-4o-mini"),  # Fast streaming LLM
         tts=cartesia.TTS(
             model="sonic-3",
             voice="87748186-23bb-4158-a1eb-332911b0b708",
         ),
+        # Preemptive generation stays off: on_user_turn_completed adds a camera image to
+        # every turn, which would discard the preemptive reply each time
+        preemptive_generation=False,
         # Disable interruption - bot must finish speaking before listening again
-        preemptive_generation=False,      # Don't allow overlapping speech
         resume_false_interruption=False,  # Don't resume after interruption attempts
         allow_interruptions=False,        # Explicitly disable interruptions
     )
@@ -267,8 +330,7 @@ async def entrypoint(ctx: agents.JobContext):
         ),
     )
 
-    persona_config = _load_persona_config()
-    config_text = _format_persona_config(persona_config)
+    _, config_text = _load_persona_config()
 
     await session.generate_reply(
         instructions=f"""{config_text}
@@ -278,16 +340,10 @@ When you wake up, greet with: 'Systems nominal.' or 'All systems operational.'""
 
 
 if __name__ == "__main__":
-    import argparse
-
-    parser = argparse.ArgumentParser()
-    parser.add_argument(
-        "--stream", action="store_true", help="Enable data streaming for visualization"
-    )
-    parser.add_argument(
-        "--stream-port", type=int, default=5556, help="Port for ZMQ data streaming"
-    )
-    args, unknown = parser.parse_known_args()
     agents.cli.run_app(
-        agents.WorkerOptions(entrypoint_fnc=entrypoint, num_idle_processes=1)
+        agents.WorkerOptions(
+            entrypoint_fnc=entrypoint,
+            prewarm_fnc=prewarm,
+            num_idle_processes=1,
+        )
     )
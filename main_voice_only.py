@@ -1,5 +1,7 @@
 import logging
 import os
+import sys
+from functools import lru_cache
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -19,19 +21,24 @@ from livekit.plugins import (
 
 load_dotenv()
 
+# uvloop's event loop is considerably faster than the stdlib selector loop for the
+# socket-heavy LiveKit session; installed at import so job processes pick it up too
+if sys.platform != "win32":
+    import uvloop
 
+    uvloop.install()
+
+_SYSTEM_PROMPT_PATH = Path(__file__).parent / "lekiwi" / "personality" / "system.txt"
+
+
+@lru_cache(maxsize=1)
 def _load_system_prompt() -> str:
     """Load the system prompt from the personality/system.txt file."""
-    # Get the directory where this file is located
-    current_dir = Path(__file__).parent
-    system_prompt_path = current_dir / "lekiwi" / "personality" / "system.txt"
-
     try:
-        with open(system_prompt_path, "r", encoding="utf-8") as f:
-            return f.read().strip()
+        return _SYSTEM_PROMPT_PATH.read_text(encoding="utf-8").strip()
     except FileNotFoundError:
         raise FileNotFoundError(
-            f"System prompt file not found at {system_prompt_path}. "
+            f"System prompt file not found at {_SYSTEM_PROMPT_PATH}. "
             "Please ensure the file exists."
         )
 
@@ -50,24 +57,32 @@ class LeKiwiVoiceTest(Agent):
         return "Status: Nominal (Voice Test Mode - No Motors Connected)"
 
 
+# Load the VAD model when the job process starts, so idle processes have it
+# ready before a job is assigned instead of loading it on the first turn
+def prewarm(proc: agents.JobProcess):
+    proc.userdata["vad"] = silero.VAD.load(
+        min_speech_duration=0.5,      # Require 500ms of continuous speech
+        min_silence_duration=1.0,     # Require 1 second of silence to detect turn end
+        activation_threshold=0.8,     # Very high threshold - ignore most sounds
+    )  # Voice Activity Detection - tuned to prevent interruption
+
+
 # Entry to the agent
 async def entrypoint(ctx: agents.JobContext):
     agent = LeKiwiVoiceTest()
 
     session = AgentSession(
-        vad=silero.VAD.load(
-            min_speech_duration=0.5,      # Require 500ms of continuous speech
-            min_silence_duration=1.0,     # Require 1 second of silence to detect turn end
-            activation_threshold=0.8,     # Very high threshold - ignore most sounds
-        ),  # Voice Activity Detection - tuned to prevent interruption
+        vad=ctx.proc.userdata["vad"],  # Loaded in prewarm()
         stt=cartesia.STT(),      # Or deepgram.STT() for faster/cheaper option
         llm=openai.LLM(model="gpt-4o-mini"),  # Fast streaming LLM
         tts=cartesia.TTS(
             model="sonic-3",
             voice="87748186-23bb-4158-a1eb-332911b0b708",
         ),
+        # Start the LLM on the final transcript instead of waiting for the end of turn;
+        # the reply is only spoken once the turn is over, so speech never overlaps
+        preemptive_generation=True,
         # Disable interruption - bot must finish speaking before listening again
-        preemptive_generation=False,      # Don't allow overlapping speech
         resume_false_interruption=False,  # Don't resume after interruption attempts
         allow_interruptions=False,        # Explicitly disable interruptions
     )
@@ -89,5 +104,9 @@ async def entrypoint(ctx: agents.JobContext):
 
 if __name__ == "__main__":
     agents.cli.run_app(
-        agents.WorkerOptions(entrypoint_fnc=entrypoint, num_idle_processes=1)
+        agents.WorkerOptions(
+            entrypoint_fnc=entrypoint,
+            prewarm_fnc=prewarm,
+            num_idle_processes=1,
+        )
     )
@@ -10,22 +10,54 @@ Displays:
 - MediaPipe skeleton
 - Fall detection status
 - Motor states
+
+Messages are multipart: a JSON header {"type", "timestamp", "data", "images"}
+followed by one raw JPEG frame per name listed in "images", in that order.
 """
 
 import argparse
-import base64
 import numbers
+import queue
+import threading
 
-import cv2
 import numpy as np
+import orjson
 import rerun as rr
 import zmq
+from turbojpeg import TurboJPEG, TJPF_RGB
+
+
+# Parsed messages waiting to be logged. When rerun falls behind, the oldest
+# message is dropped so the viewer stays on live state.
+LOG_QUEUE_SIZE = 16
+
+# Fixed schema of motor messages, logged as one named batch per entity
+# (arm positions and base velocities have different units, so separate plots)
+_ARM_MOTOR_KEYS = (
+    "arm_shoulder_pan.pos",
+    "arm_shoulder_lift.pos",
+    "arm_elbow_flex.pos",
+    "arm_wrist_flex.pos",
+    "arm_wrist_roll.pos",
+    "arm_gripper.pos",
+)
+_BASE_MOTOR_KEYS = ("x.vel", "y.vel", "theta.vel")
+_MOTOR_ENTITIES = (
+    ("motors/arm", _ARM_MOTOR_KEYS),
+    ("motors/base", _BASE_MOTOR_KEYS),
+)
+_MOTOR_KEY_SET = frozenset(_ARM_MOTOR_KEYS + _BASE_MOTOR_KEYS)
+
+# Exact types of the scalars that actually arrive (JSON numbers and common numpy
+# dtypes), checked before the slower numbers.Real ABC lookup
+_SCALAR_TYPES = frozenset({float, int, np.float32, np.float64, np.int32, np.int64})
 
 
 def _is_scalar(x):
     """Check if value is a scalar."""
-    return isinstance(x, (float | numbers.Real | np.integer | np.floating)) or (
-        isinstance(x, np.ndarray) and x.ndim == 0
+    return type(x) in _SCALAR_TYPES or (
+        isinstance(x, (float | numbers.Real | np.integer | np.floating))
+        or (isinstance(x, np.ndarray) and x.ndim == 0)
     )
 
 
@@ -34,71 +66,114 @@ class LeKiwiObserver:
         # ZMQ subscriber
         context = zmq.Context()
         self.socket = context.socket(zmq.SUB)
+        # Keep only a short queue so a slow viewer shows live state rather than
+        # a growing backlog (must be set before connect). CONFLATE is not used:
+        # all data types share this socket and it would drop whole types.
+        self.socket.setsockopt(zmq.RCVHWM, 4)
         self.socket.connect(f"tcp://{host_ip}:{port}")
         self.socket.setsockopt_string(zmq.SUBSCRIBE, "")
+        self.poller = zmq.Poller()
+        self.poller.register(self.socket, zmq.POLLIN)
         print(f"Connected to LeKiwi stream at {host_ip}:{port}")
 
         # Initialize Rerun
         rr.init("lekiwi_autopilot_observer")
         rr.spawn(memory_limit="25%")
+        for entity_path, keys in _MOTOR_ENTITIES:
+            rr.log(entity_path, rr.SeriesLines(names=list(keys)), static=True)
         print("Rerun viewer initialized")
 
+        # libjpeg-turbo decoder for camera frames
+        self._tj = TurboJPEG()
+
+        # Receiving and decoding run on the main thread, rerun logging on a
+        # worker, so a slow viewer doesn't back up the zmq socket
+        self._log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        self._running = threading.Event()
+
+        # Reused by the log worker for every motor message
+        self._motor_bufs = [
+            (entity_path, keys, np.empty(len(keys), dtype=np.float64))
+            for entity_path, keys in _MOTOR_ENTITIES
+        ]
+
+        # Value type -> logger, checked before falling back to isinstance
+        self._handlers = {
+            float: self._log_scalar,
+            int: self._log_scalar,
+            np.float32: self._log_scalar,
+            np.float64: self._log_scalar,
+            str: self._log_text,
+            np.ndarray: self._log_array,
+            dict: self._log_data,
+            list: self._log_sequence,
+            tuple: self._log_sequence,
+        }
+
     def _log_data(self, prefix: str, data: dict):
         """Log dictionary data to rerun, handling scalars, arrays, and images."""
+        handlers = self._handlers
         for key, value in data.items():
             if value is None:
                 continue
 
-            entity_path = f"{prefix}/{key}"
+            # Exact-type lookup for the common cases; subclasses and numpy
+            # scalar types go through the isinstance checks
+            handler = handlers.get(type(value), self._log_other)
+            handler(f"{prefix}/{key}", value)
 
-            if _is_scalar(value):
-                rr.log(entity_path, rr.Scalars(float(value)))
-            elif isinstance(value, str):
-                # Handle base64 encoded images (from camera streams)
-                if key.endswith("_camera") or "image" in key.lower():
-                    try:
-                        img_bytes = base64.b64decode(value)
-                        img_array = np.frombuffer(img_bytes, dtype=np.uint8)
-                        img = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
-                        if img is not None:
-                            # Convert BGR to RGB for rerun
-                            img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-                            rr.log(entity_path, rr.Image(img_rgb))
-                    except Exception as e:
-                        print(f"Failed to decode image for {key}: {e}")
-                else:
-                    # Log as text annotation
-                    rr.log(entity_path, rr.TextLog(value))
-            elif isinstance(value, np.ndarray):
-                arr = value
-                # Convert CHW -> HWC for images
-                if (
-                    arr.ndim == 3
-                    and arr.shape[0] in (1, 3, 4)
-                    and arr.shape[-1] not in (1, 3, 4)
-                ):
-                    arr = np.transpose(arr, (1, 2, 0))
-
-                if arr.ndim == 1:
-                    # Log 1D arrays as individual scalars
-                    for i, vi in enumerate(arr):
-                        rr.log(f"{entity_path}_{i}", rr.Scalars(float(vi)))
-                elif arr.ndim in (2, 3):
-                    # Log as image
-                    rr.log(entity_path, rr.Image(arr))
-                else:
-                    # Flatten and log higher-dimensional arrays
-                    flat = arr.flatten()
-                    for i, vi in enumerate(flat):
-                        rr.log(f"{entity_path}_{i}", rr.Scalars(float(vi)))
-            elif isinstance(value, dict):
-                # Recursively log nested dictionaries
-                self._log_data(entity_path, value)
-            elif isinstance(value, (list, tuple)):
-                # Log sequences as scalars
-                for i, vi in enumerate(value):
-                    if _is_scalar(vi):
-                        rr.log(f"{entity_path}_{i}", rr.Scalars(float(vi)))
+    def _log_scalar(self, entity_path: str, value):
+        rr.log(entity_path, rr.Scalars(float(value)))
+
+    def _log_text(self, entity_path: str, value: str):
+        # Log as text annotation
+        rr.log(entity_path, rr.TextLog(value))
+
+    def _log_array(self, entity_path: str, arr: np.ndarray):
+        if arr.ndim == 0:
+            self._log_scalar(entity_path, arr)
+            return
+
+        # Convert CHW -> HWC for images
+        if (
+            arr.ndim == 3
+            and arr.shape[0] in (1, 3, 4)
+            and arr.shape[-1] not in (1, 3, 4)
+        ):
+            # Copy once into HWC order rather than handing rerun a strided view
+            arr = np.ascontiguousarray(arr.transpose(1, 2, 0))
+
+        if arr.ndim == 1:
+            # Log 1D arrays as one batch of scalars
+            rr.log(entity_path, rr.Scalars(np.ascontiguousarray(arr, dtype=np.float64)))
+        elif arr.ndim in (2, 3):
+            # Log as image
+            rr.log(entity_path, rr.Image(arr))
+        else:
+            # Flatten and log higher-dimensional arrays as one batch
+            rr.log(entity_path, rr.Scalars(arr.reshape(-1).astype(np.float64, copy=False)))
+
+    def _log_sequence(self, entity_path: str, value):
+        # Log the scalar elements of sequences as one batch
+        scalars = np.fromiter(
+            (float(vi) for vi in value if _is_scalar(vi)), dtype=np.float64
+        )
+        if scalars.size:
+            rr.log(entity_path, rr.Scalars(scalars))
+
+    def _log_other(self, entity_path: str, value):
+        """Slow path for values whose exact type is not in the handler table."""
+        if _is_scalar(value):
+            self._log_scalar(entity_path, value)
+        elif isinstance(value, str):
+            self._log_text(entity_path, value)
+        elif isinstance(value, np.ndarray):
+            self._log_array(entity_path, value)
+        elif isinstance(value, dict):
+            # Recursively log nested dictionaries
+            self._log_data(entity_path, value)
+        elif isinstance(value, (list, tuple)):
+            self._log_sequence(entity_path, value)
 
     def _render_pose(self, data: dict):
         """Render pose detection data."""
@@ -111,9 +186,13 @@ class LeKiwiObserver:
         # If landmarks are present, visualize them
         if "landmarks" in data and isinstance(data["landmarks"], (list, np.ndarray)):
             # MediaPipe pose landmarks are typically 33 points with x, y, z, visibility
-            landmarks = np.array(data["landmarks"])
+            landmarks = np.asarray(data["landmarks"], dtype=np.float32)
             if landmarks.size > 0:
-                rr.log("pose/landmarks", rr.Points3D(landmarks))
+                if landmarks.ndim == 1:
+                    # Flat list of (x, y, z, visibility) values
+                    landmarks = landmarks.reshape(-1, 4)
+                # Points3D takes x, y, z only; drop the visibility channel
+                rr.log("pose/landmarks", rr.Points3D(landmarks[:, :3]))
 
     def _render_camera(self, data: dict):
         """Render camera data."""
@@ -121,44 +200,118 @@ class LeKiwiObserver:
 
     def _render_motors(self, data: dict):
         """Render motor state data."""
-        self._log_data("motors", data)
+        # Missing motors are logged as NaN (a gap in their series), so the
+        # entity layout doesn't depend on which keys a message carries
+        for entity_path, keys, buf in self._motor_bufs:
+            for i, key in enumerate(keys):
+                value = data.get(key)
+                buf[i] = np.nan if value is None else value
+            rr.log(entity_path, rr.Scalars(buf))
+
+        if data.keys() != _MOTOR_KEY_SET:
+            # Log anything outside the schema generically
+            self._log_data("motors", {
+                key: value for key, value in data.items() if key not in _MOTOR_KEY_SET
+            })
+
+    def _decode_images(self, names: list, frames: list) -> list:
+        """Decode the raw JPEG frames of a message into (name, RGB image) pairs."""
+        images = []
+        for name, frame in zip(names, frames):
+            try:
+                # Decode straight to RGB for rerun, no BGR round trip
+                images.append((name, self._tj.decode(frame.buffer, pixel_format=TJPF_RGB)))
+            except Exception as e:
+                print(f"Failed to decode image for {name}: {e}")
+        return images
+
+    def _parse_message(self, frames: list) -> tuple:
+        """Parse a multipart message into (type, timestamp, data, images)."""
+        # Parse straight from the zmq frame's buffer, without a bytes copy
+        header, *image_frames = frames
+        message = orjson.loads(header.buffer)
+        data_type = message.get("type", "unknown")
+        timestamp = message.get("timestamp", 0)
+        data = message.get("data", {})
+
+        # JPEGs travel as binary frames after the header, not base64 in the JSON
+        images = []
+        if image_frames:
+            images = self._decode_images(message.get("images", []), image_frames)
+
+        return data_type, timestamp, data, images
+
+    def _enqueue(self, item: tuple):
+        """Queue a parsed message for logging, dropping the oldest one if full."""
+        try:
+            self._log_queue.put_nowait(item)
+        except queue.Full:
+            # Only the log worker takes items, so there is room after this
+            try:
+                self._log_queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._log_queue.put_nowait(item)
+
+    def _render(self, data_type: str, timestamp: float, data: dict, images: list):
+        """Log a parsed message with the renderer for its type."""
+        # Set the recording time for rerun (per thread, so it's set on the worker)
+        rr.set_time_seconds("timestamp", timestamp)
+
+        for name, img_rgb in images:
+            rr.log(f"{data_type}/{name}", rr.Image(img_rgb))
+
+        # Route to appropriate renderer
+        if data_type == "pose":
+            self._render_pose(data)
+        elif data_type == "camera":
+            self._render_camera(data)
+        elif data_type == "motors":
+            self._render_motors(data)
+        else:
+            # Log unknown data types generically
+            self._log_data(data_type, data)
+
+    def _log_worker(self):
+        """Worker thread that logs queued messages to rerun."""
+        while self._running.is_set():
+            try:
+                item = self._log_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            try:
+                self._render(*item)
+            except Exception as e:
+                print(f"Error logging message: {e}")
 
     def run(self):
         """Main visualization loop."""
         print("Starting observation loop...")
+        self._running.set()
+        log_thread = threading.Thread(target=self._log_worker, daemon=True, name="rerun-logger")
+        log_thread.start()
         try:
             while True:
-                try:
-                    # Non-blocking receive with timeout
-                    message = self.socket.recv_json(flags=zmq.NOBLOCK)
-                    data_type = message.get("type", "unknown")
-                    timestamp = message.get("timestamp", 0)
-                    data = message.get("data", {})
-
-                    # Set the recording time for rerun
-                    rr.set_time_seconds("timestamp", timestamp)
-
-                    # Route to appropriate renderer
-                    if data_type == "pose":
-                        self._render_pose(data)
-                    elif data_type == "camera":
-                        self._render_camera(data)
-                    elif data_type == "motors":
-                        self._render_motors(data)
-                    else:
-                        # Log unknown data types generically
-                        self._log_data(data_type, data)
-
-                except zmq.Again:
-                    # No message available, continue
-                    continue
-                except Exception as e:
-                    print(f"Error processing message: {e}")
+                # Sleep until a message arrives (the timeout keeps Ctrl+C responsive)
+                if not self.poller.poll(timeout=100):
                     continue
 
+                # Drain everything queued since the last wake-up
+                while True:
+                    try:
+                        frames = self.socket.recv_multipart(flags=zmq.NOBLOCK, copy=False)
+                    except zmq.Again:
+                        break
+                    try:
+                        self._enqueue(self._parse_message(frames))
+                    except Exception as e:
+                        print(f"Error processing message: {e}")
+
         except KeyboardInterrupt:
             print("\nShutting down observer...")
         finally:
+            self._running.clear()
+            log_thread.join(timeout=1.0)
             self.socket.close()
 
 
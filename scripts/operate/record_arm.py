@@ -1,5 +1,4 @@
 import argparse
-import csv
 import os
 import sys
 import time
@@ -7,7 +6,8 @@ import time
 from lerobot.robots.lekiwi.config_lekiwi import LeKiwiClientConfig
 from lerobot.robots.lekiwi.lekiwi_client import LeKiwiClient
 from lerobot.teleoperators.so100_leader import SO100Leader, SO100LeaderConfig
-from lerobot.utils.robot_utils import precise_sleep
+
+from .utils import ARM_RENAME, FLUSH_INTERVAL_S, ZERO_BASE, FrameClock
 
 
 def main():
@@ -70,36 +70,33 @@ def main():
         "arm_gripper.pos",
     ]
 
+    # Fixed numeric columns, so rows are written from one format string
+    row_format = ",".join(["{}"] * (len(arm_keys) + 1)) + "\n"
+
     with open(csv_filename, "w", newline="") as csvfile:
-        csv_writer = None
+        csvfile.write(",".join(["timestamp"] + arm_keys) + "\n")
+        last_flush = time.perf_counter()
 
+        clock = FrameClock(args.fps)
         try:
             while True:
                 t0 = time.perf_counter()
 
                 leader_action = leader_arm.get_action()  # type: ignore[attribute-error]
-                obs = {f"arm_{key}": val for key, val in leader_action.items()}
-                # Add empty base velocities (robot expects both arm and base actions)
-                action = {
-                    **obs,
-                    "x.vel": 0.0,
-                    "y.vel": 0.0,
-                    "theta.vel": 0.0,
-                }
+                obs = {ARM_RENAME[key]: val for key, val in leader_action.items()}
+                # Add empty base velocities in place (obs is only read for arm keys)
+                action = obs
+                action.update(ZERO_BASE)
                 robot.send_action(action)
 
-                if csv_writer is None:
-                    fieldnames = ["timestamp"] + arm_keys
-                    csv_writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    csv_writer.writeheader()
-
-                row = {"timestamp": t0}
-                for key in arm_keys:
-                    row[key] = obs.get(key, 0.0)
-                csv_writer.writerow(row)
-                csvfile.flush()
+                csvfile.write(
+                    row_format.format(t0, *[obs.get(key, 0.0) for key in arm_keys])
+                )
+                if t0 - last_flush >= FLUSH_INTERVAL_S:
+                    csvfile.flush()
+                    last_flush = t0
 
-                precise_sleep(max(1.0 / args.fps - (time.perf_counter() - t0), 0.0))
+                clock.wait()
 
         except KeyboardInterrupt:
             print("Shutting down teleop...")
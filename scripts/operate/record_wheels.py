@@ -1,5 +1,4 @@
 import argparse
-import csv
 import os
 import sys
 import time
@@ -10,7 +9,8 @@ from lerobot.robots.lekiwi.config_lekiwi import LeKiwiClientConfig
 from lerobot.robots.lekiwi.lekiwi_client import LeKiwiClient
 from lerobot.teleoperators.keyboard.teleop_keyboard import KeyboardTeleop
 from lerobot.teleoperators.keyboard.configuration_keyboard import KeyboardTeleopConfig
-from lerobot.utils.robot_utils import precise_sleep
+
+from .utils import FLUSH_INTERVAL_S, ArmPositionPoller, FrameClock
 
 
 def main():
@@ -47,6 +47,10 @@ def main():
     keyboard = KeyboardTeleop(keyboard_config)
     keyboard.connect()
 
+    # Arm positions are read in the background; the loop only holds the arm in place
+    arm_poller = ArmPositionPoller(robot)
+    arm_poller.start()
+
     input("Press Enter to start recording...")
 
     recordings_dir = os.path.join(
@@ -64,49 +68,48 @@ def main():
         "theta.vel",
     ]
 
+    # Fixed numeric columns, so rows are written from one format string
+    row_format = ",".join(["{}"] * (len(wheel_keys) + 1)) + "\n"
+
     with open(csv_filename, "w", newline="") as csvfile:
-        csv_writer = None
+        csvfile.write(",".join(["timestamp"] + wheel_keys) + "\n")
+        last_flush = time.perf_counter()
+        # Base action is only recomputed when the pressed keys change
+        last_keys = None
+        base_action = {}
 
+        clock = FrameClock(args.fps)
         try:
             while True:
                 t0 = time.perf_counter()
 
-                keyboard_keys = keyboard.get_action()
-                # Convert dict keys to numpy array for _from_keyboard_to_base_action
-                pressed_keys_array = np.array(list(keyboard_keys.keys()))
-                base_action = robot._from_keyboard_to_base_action(pressed_keys_array)
-
-                # Keep existing arm positions
-                present_position = robot.get_observation()
-                arm_action = {
-                    key: float(value)
-                    for key, value in present_position.items()
-                    if key.endswith(".pos")
-                }
+                pressed_keys = frozenset(keyboard.get_action())
+                if pressed_keys != last_keys:
+                    # Convert keys to numpy array for _from_keyboard_to_base_action
+                    pressed_keys_array = np.array(list(pressed_keys))
+                    base_action = robot._from_keyboard_to_base_action(pressed_keys_array)
+                    last_keys = pressed_keys
 
                 # Keep existing arm position
                 action = {
                     **base_action,
-                    **arm_action,
+                    **arm_poller.arm_action,
                 }
                 robot.send_action(action)
 
-                if csv_writer is None:
-                    fieldnames = ["timestamp"] + wheel_keys
-                    csv_writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    csv_writer.writeheader()
-
-                row = {"timestamp": t0}
-                for key in wheel_keys:
-                    row[key] = base_action.get(key, 0.0)
-                csv_writer.writerow(row)
-                csvfile.flush()
+                csvfile.write(
+                    row_format.format(t0, *[base_action.get(key, 0.0) for key in wheel_keys])
+                )
+                if t0 - last_flush >= FLUSH_INTERVAL_S:
+                    csvfile.flush()
+                    last_flush = t0
 
-                precise_sleep(max(1.0 / args.fps - (time.perf_counter() - t0), 0.0))
+                clock.wait()
 
         except KeyboardInterrupt:
             print("Shutting down teleop...")
         finally:
+            arm_poller.stop()
             robot.disconnect()
             if keyboard is not None:
                 keyboard.disconnect()
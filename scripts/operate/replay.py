@@ -15,14 +15,23 @@
 # limitations under the License.
 
 import argparse
-import csv
 import os
+import signal
 import sys
-import time
+
+import numpy as np
 
 from lerobot.robots.lekiwi.config_lekiwi import LeKiwiClientConfig
 from lerobot.robots.lekiwi.lekiwi_client import LeKiwiClient
-from lerobot.utils.robot_utils import precise_sleep
+
+from .utils import (
+    ZERO_BASE,
+    ActionSender,
+    FrameClock,
+    IntervalTimerClock,
+    enable_realtime,
+    read_arm_positions,
+)
 
 
 def main():
@@ -48,6 +57,11 @@ def main():
     parser.add_argument(
         "--fps", type=int, default=30, help="Frames per second for replay (default: 30)"
     )
+    parser.add_argument(
+        "--realtime",
+        action="store_true",
+        help="Lock memory, pin to one CPU and use SCHED_FIFO (Linux, needs privileges)",
+    )
     args = parser.parse_args()
 
     # Initialize the robot config
@@ -65,10 +79,24 @@ def main():
     if not os.path.exists(csv_path):
         raise FileNotFoundError(f"Recording not found: {csv_path}")
 
-    # Read CSV file and replay actions
-    with open(csv_path, "r") as csvfile:
-        csv_reader = csv.DictReader(csvfile)
-        actions = list(csv_reader)
+    # Parse the whole CSV up front, so the replay loop does no text-to-float
+    # conversion. unpack=True gives one float32 array per column (column 0 is
+    # the timestamp) rather than a list of rows.
+    # Large read buffer so a long recording loads in a few reads
+    with open(csv_path, "r", buffering=1 << 20) as csvfile:
+        header = csvfile.readline().strip().split(",")
+        columns = np.loadtxt(
+            csvfile, delimiter=",", ndmin=2, dtype=np.float32, unpack=True
+        )
+    # unpack=True returns a transposed view of the row-major parse; copy it
+    # once so each column is contiguous in memory
+    columns = np.ascontiguousarray(columns)
+    num_frames = columns.shape[1]
+    # Keys interned so the per-frame dict stores hit the identity fast path
+    action_columns = [
+        (sys.intern(key), column) for key, column in zip(header[1:], columns[1:])
+    ]
+    action_keys = [key for key, _ in action_columns]
 
     # Connect to the robot
     robot.connect()
@@ -76,51 +104,59 @@ def main():
     if not robot.is_connected:
         raise ValueError("Robot is not connected!")
 
-    print(f"Replaying {len(actions)} actions from {csv_path} (type: {recording_type})")
-    print("Starting replay loop...")
+    # Wheels replays hold the arm where it is, so its pose is read once up front
+    held_arm_action = {}
+    if recording_type == "wheels":
+        held_arm_action = read_arm_positions(robot)
 
-    for row in actions:
-        t0 = time.perf_counter()
-
-        if recording_type == "arm":
-            # Extract arm action data (exclude timestamp column)
-            arm_action = {
-                key: float(value) for key, value in row.items() if key != "timestamp"
-            }
-
-            # Add empty base velocities (robot expects both arm and base actions)
-            action = {
-                **arm_action,
-                "x.vel": 0.0,
-                "y.vel": 0.0,
-                "theta.vel": 0.0,
-            }
-        else:  # wheels
-            # Extract base velocities (exclude timestamp column)
-            base_action = {
-                key: float(value) for key, value in row.items() if key != "timestamp"
-            }
-
-            present_position = robot.get_observation()
-            # Keep existing arm positions
-            arm_action = {
-                key: float(value)
-                for key, value in present_position.items()
-                if key.endswith(".pos")
-            }
-
-            # Keep existing arm position
-            action = {
-                **base_action,
-                **arm_action,
-            }
-
-        # Send action to robot
-        _ = robot.send_action(action)
-
-        precise_sleep(max(1.0 / args.fps - (time.perf_counter() - t0), 0.0))
+    print(f"Replaying {num_frames} actions from {csv_path} (type: {recording_type})")
+    print("Starting replay loop...")
 
+    if args.realtime:
+        # Before starting the sender thread, so it inherits the settings
+        enable_realtime()
+
+    # One action dict reused for every frame: the recorded columns are
+    # overwritten per row, the other half of the action stays fixed
+    action = dict.fromkeys(action_keys, 0.0)
+    if recording_type == "arm":
+        # Add empty base velocities (robot expects both arm and base actions)
+        action.update(ZERO_BASE)
+    else:  # wheels
+        # Keep existing arm position
+        action.update(held_arm_action)
+
+    # Frames are clocked by a kernel interval timer where available. Created
+    # before the sender thread, which must inherit the blocked SIGALRM.
+    if hasattr(signal, "setitimer"):
+        clock = IntervalTimerClock(args.fps)
+    else:
+        clock = FrameClock(args.fps)
+
+    # Sends run on a worker thread; the action dict is snapshotted on enqueue
+    sender = ActionSender(robot)
+    sender.start()
+
+    # Bound once so the loop body does local lookups only
+    send_action = sender.send
+    wait = clock.wait
+    try:
+        for i in range(num_frames):
+            # Overwrite the recorded values in place, read column by column
+            for key, column in action_columns:
+                action[key] = column.item(i)
+
+            # Send action to robot
+            send_action(action)
+
+            wait()
+    finally:
+        clock.stop()
+
+    sender.stop()
     print("Replay complete!")
+    if clock.dropped_frames:
+        print(f"Fell behind and skipped {clock.dropped_frames} frame slot(s)")
     robot.disconnect()
 
 
@@ -16,7 +16,6 @@
 
 import argparse
 import sys
-import time
 
 from lerobot.robots.lekiwi import LeKiwiClient, LeKiwiClientConfig
 from lerobot.teleoperators.keyboard.teleop_keyboard import (
@@ -24,9 +23,11 @@ from lerobot.teleoperators.keyboard.teleop_keyboard import (
     KeyboardTeleopConfig,
 )
 from lerobot.teleoperators.so100_leader import SO100Leader, SO100LeaderConfig
-from lerobot.utils.robot_utils import precise_sleep
 from lerobot.utils.visualization_utils import init_rerun, log_rerun_data
 
+from .utils import ARM_RENAME, FrameClock
+
+
 FPS = 30
 
 
@@ -86,19 +87,24 @@ def main():
         raise ValueError("Robot or teleop is not connected!")
 
     print("Starting teleop loop...")
+    # Base action is only recomputed when the pressed keys change
+    last_keys = None
+    base_action = {}
+    clock = FrameClock(FPS)
     while True:
-        t0 = time.perf_counter()
-
         # Get robot observation
         observation = robot.get_observation()
 
         # Get teleop action
         # Arm
         arm_action = leader_arm.get_action()
-        arm_action = {f"arm_{k}": v for k, v in arm_action.items()}
+        arm_action = {ARM_RENAME[k]: v for k, v in arm_action.items()}
         # Keyboard
         keyboard_keys = keyboard.get_action()
-        base_action = robot._from_keyboard_to_base_action(keyboard_keys)
+        pressed_keys = frozenset(keyboard_keys)
+        if pressed_keys != last_keys:
+            base_action = robot._from_keyboard_to_base_action(keyboard_keys)
+            last_keys = pressed_keys
 
         action = {**arm_action, **base_action} if len(base_action) > 0 else arm_action
 
@@ -108,7 +114,7 @@ def main():
         # Visualize
         log_rerun_data(observation=observation, action=action)
 
-        precise_sleep(max(1.0 / FPS - (time.perf_counter() - t0), 0.0))
+        clock.wait()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,272 @@
+import ctypes
+import ctypes.util
+import os
+import queue
+import signal
+import threading
+import time
+
+from lerobot.robots.lekiwi.lekiwi_client import LeKiwiClient
+
+
+# mlockall flags (sys/mman.h): lock pages mapped now and in the future
+_MCL_CURRENT = 1
+_MCL_FUTURE = 2
+
+# Leader arm motor key -> LeKiwi action key
+ARM_RENAME = {
+    key: f"arm_{key}"
+    for key in (
+        "shoulder_pan.pos",
+        "shoulder_lift.pos",
+        "elbow_flex.pos",
+        "wrist_flex.pos",
+        "wrist_roll.pos",
+        "gripper.pos",
+    )
+}
+
+# Zero base velocities, merged into arm-only actions (the robot expects both)
+ZERO_BASE = {"x.vel": 0.0, "y.vel": 0.0, "theta.vel": 0.0}
+
+# Recording scripts flush the CSV at most this often (seconds), not every row
+FLUSH_INTERVAL_S = 1.0
+
+# Sleep until this close to a deadline, then spin for the rest; time.sleep can
+# overshoot by up to about a millisecond
+SPIN_MARGIN_S = 0.001
+
+
+def enable_realtime(priority: int = 50) -> None:
+    """
+    Best-effort real-time setup for a control loop (Linux only): lock memory
+    so page faults can't stall a frame, pin the process to the last CPU and
+    switch it to SCHED_FIFO. Threads started afterwards inherit the affinity
+    and policy. Each step needs privileges (CAP_IPC_LOCK / CAP_SYS_NICE) and
+    is skipped with a message if it fails.
+    """
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if libc.mlockall(_MCL_CURRENT | _MCL_FUTURE) != 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+        print("Locked process memory")
+    except (OSError, AttributeError) as e:
+        print(f"Could not lock memory: {e}")
+
+    try:
+        cpu = max(os.sched_getaffinity(0))
+        os.sched_setaffinity(0, {cpu})
+        print(f"Pinned to CPU {cpu}")
+    except (OSError, AttributeError) as e:
+        print(f"Could not set CPU affinity: {e}")
+
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+        print(f"Running with SCHED_FIFO priority {priority}")
+    except (OSError, AttributeError) as e:
+        print(f"Could not set SCHED_FIFO: {e}")
+
+
+class FrameClock:
+    """
+    Paces a control loop to a fixed rate using absolute deadlines.
+
+    Each tick's deadline is the previous one plus the period, so time spent in
+    the loop body doesn't accumulate as drift. Waiting sleeps for most of the
+    remaining time and only spins for the last SPIN_MARGIN_S, so the CPU is
+    idle for most of each frame. A loop that runs more than a whole period
+    late is re-anchored to the current time instead of rushing through the
+    missed frames; those frames are counted in dropped_frames.
+
+    Usage:
+        clock = FrameClock(fps=30)
+        while True:
+            ...
+            clock.wait()
+    """
+
+    def __init__(self, fps: float):
+        self.period = 1.0 / fps
+        self.next_tick = time.perf_counter() + self.period
+        self.dropped_frames = 0
+
+    def wait(self) -> None:
+        """Block until the current tick's deadline, then advance to the next one."""
+        now = time.perf_counter()
+        remaining = self.next_tick - now
+        if remaining < -self.period:
+            self.dropped_frames += int(-remaining / self.period)
+            self.next_tick = now + self.period
+            return
+        if remaining > 2 * SPIN_MARGIN_S:
+            time.sleep(remaining - SPIN_MARGIN_S)
+        while time.perf_counter() < self.next_tick:
+            pass
+        self.next_tick += self.period
+
+    def stop(self) -> None:
+        """Nothing to release; matches IntervalTimerClock.stop()."""
+
+
+class IntervalTimerClock:
+    """
+    Paces a control loop from a POSIX interval timer instead of sleeping.
+
+    The kernel raises SIGALRM every period and wait() blocks in sigwait()
+    until the next one, so the tick cadence comes from the kernel timer
+    rather than from sleep() accuracy. SIGALRM is blocked in the creating
+    thread, and threads started later inherit that, so the signal is only
+    ever consumed by wait(): create the clock before starting other threads.
+    Ticks that pass while the loop body overruns are counted in
+    dropped_frames. POSIX only (see signal.setitimer).
+
+    Usage:
+        clock = IntervalTimerClock(fps=30)
+        try:
+            while True:
+                ...
+                clock.wait()
+        finally:
+            clock.stop()
+    """
+
+    def __init__(self, fps: float):
+        self.period = 1.0 / fps
+        self.dropped_frames = 0
+        self._ticks = 0
+        signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+        self._start = time.perf_counter()
+        signal.setitimer(signal.ITIMER_REAL, self.period, self.period)
+
+    def wait(self) -> None:
+        """Block until the next timer tick."""
+        signal.sigwait({signal.SIGALRM})
+        # Pending SIGALRMs coalesce into one, so count missed ticks from time
+        ticks = int((time.perf_counter() - self._start) / self.period)
+        if ticks > self._ticks + 1:
+            self.dropped_frames += ticks - self._ticks - 1
+        self._ticks = max(ticks, self._ticks + 1)
+
+    def stop(self) -> None:
+        """Cancel the timer and restore normal SIGALRM delivery."""
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        # Consume a tick that is still pending, so unblocking doesn't deliver
+        # it with its default action (terminate)
+        if signal.SIGALRM in signal.sigpending():
+            signal.sigwait({signal.SIGALRM})
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGALRM})
+
+
+def read_arm_positions(robot: LeKiwiClient) -> dict[str, float]:
+    """Read one observation and return its arm positions (the ".pos" keys)."""
+    observation = robot.get_observation()
+    return {
+        key: float(value)
+        for key, value in observation.items()
+        if key.endswith(".pos")
+    }
+
+
+class ArmPositionPoller:
+    """
+    Polls the robot's observation on a background thread and keeps the latest
+    arm positions, so control loops that only need to hold the arm in place
+    don't wait on an observation round trip every tick.
+
+    Usage:
+        poller = ArmPositionPoller(robot)
+        poller.start()
+        action = {**base_action, **poller.arm_action}
+        poller.stop()  # before disconnecting the robot
+    """
+
+    def __init__(self, robot: LeKiwiClient, interval_s: float = 1.0 / 60):
+        self.robot = robot
+        self.interval_s = interval_s
+        # Replaced in one assignment by the poller thread, so readers never
+        # need a lock to get a consistent dict
+        self.arm_action: dict[str, float] = {}
+        self._running = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """Read one observation synchronously, then keep polling in the background."""
+        self._poll_once()
+        self._running.set()
+        self._thread = threading.Thread(
+            target=self._poll_loop, daemon=True, name="arm-position-poller"
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Stop the poller thread."""
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _poll_once(self) -> None:
+        arm_action = read_arm_positions(self.robot)
+        # Keep the last known positions if the observation came back empty
+        if arm_action:
+            self.arm_action = arm_action
+
+    def _poll_loop(self) -> None:
+        while self._running.is_set():
+            try:
+                self._poll_once()
+            except Exception as e:
+                # Keep polling; arm_action holds the last positions read
+                print(f"Failed to read arm positions: {e}")
+            time.sleep(self.interval_s)
+
+
+class ActionSender:
+    """
+    Sends actions to the robot from a worker thread, so a control loop does
+    not wait on the send. At most max_in_flight actions are queued; send()
+    blocks when the queue is full, which keeps the loop from running ahead of
+    the link.
+
+    Usage:
+        sender = ActionSender(robot)
+        sender.start()
+        sender.send(action)
+        sender.stop()  # waits for queued actions before returning
+    """
+
+    def __init__(self, robot: LeKiwiClient, max_in_flight: int = 2):
+        self.robot = robot
+        self._queue: queue.Queue = queue.Queue(maxsize=max_in_flight)
+        self._thread = None
+
+    def start(self) -> None:
+        """Start the sender thread."""
+        self._thread = threading.Thread(
+            target=self._send_loop, daemon=True, name="action-sender"
+        )
+        self._thread.start()
+
+    def send(self, action: dict) -> None:
+        """Queue a snapshot of the action, so the caller may keep mutating it."""
+        self._queue.put(action.copy())
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Wait for queued actions to be sent, then stop the sender thread."""
+        self._queue.join()
+        self._queue.put(None)
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _send_loop(self) -> None:
+        while True:
+            action = self._queue.get()
+            try:
+                if action is None:
+                    return
+                self.robot.send_action(action)
+            except Exception as e:
+                print(f"Failed to send action: {e}")
+            finally:
+                self._queue.task_done()
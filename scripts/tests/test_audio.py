@@ -15,27 +15,37 @@ DURATION = 3  # seconds
 # --- Test Speaker ---
 print("Playing test tone...")
 frequency = 440  # Hz (A4 note)
-t = np.linspace(0, DURATION, int(SAMPLE_RATE * DURATION), endpoint=False)
-tone = 0.3 * np.sin(2 * np.pi * frequency * t)
-# Duplicate for stereo
-tone_stereo = np.column_stack([tone, tone])
-sd.play(tone_stereo, samplerate=SAMPLE_RATE, device=DEVICE)
+# Generate the tone straight in the soundcard's int16 format, via float32
+omega = 2 * np.pi * frequency / SAMPLE_RATE
+n = np.arange(int(SAMPLE_RATE * DURATION), dtype=np.float32)
+tone = (0.3 * 32767 * np.sin(omega * n)).astype(np.int16)
+# sounddevice duplicates mono data into every mapped channel, so no stereo copy
+sd.play(
+    tone,
+    samplerate=SAMPLE_RATE,
+    device=DEVICE,
+    mapping=list(range(1, CHANNELS + 1)),
+)
 sd.wait()
 
-# --- Test Microphone ---
-print("Recording from microphone...")
-recording = sd.rec(
-    int(DURATION * SAMPLE_RATE),
+# --- Test Microphone (live loopback) ---
+def _loopback(indata, outdata, frames, time, status):
+    """Copy each input block straight to the output."""
+    if status:
+        print(status)
+    outdata[:] = indata
+
+
+# Full duplex stream: microphone blocks go straight to the speaker on
+# PortAudio's thread, with no recording buffer and no record-then-play wait
+print(f"Looping microphone to speaker for {DURATION} seconds (speak now)...")
+with sd.Stream(
     samplerate=SAMPLE_RATE,
     channels=CHANNELS,
     device=DEVICE,
     dtype="int16",
-)
-sd.wait()
-print("Recording complete.")
-
-# --- Playback Recorded Audio ---
-print("Playing back recorded audio...")
-sd.play(recording, samplerate=SAMPLE_RATE, device=DEVICE)
-sd.wait()
+    blocksize=512,
+    callback=_loopback,
+):
+    sd.sleep(int(DURATION * 1000))
 print("Done.")
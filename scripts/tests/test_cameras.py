@@ -1,44 +1,87 @@
 #!/usr/bin/env python3
 """Test LeKiwi cameras - capture and display without saving"""
 
+import argparse
+import glob
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
 import cv2
-import matplotlib.pyplot as plt
 from pathlib import Path
 
+# Open cameras through V4L2 directly on Linux instead of letting OpenCV try
+# each backend in turn
+CAMERA_BACKEND = cv2.CAP_V4L2 if sys.platform.startswith("linux") else cv2.CAP_ANY
+
+
+def _candidate_indices(max_test):
+    """Camera indices worth probing: existing /dev/videoN nodes, else 0..max_test-1"""
+    nodes = glob.glob("/dev/video*")
+    indices = sorted(
+        int(match.group(1))
+        for match in (re.fullmatch(r"/dev/video(\d+)", node) for node in nodes)
+        if match
+    )
+    return indices or list(range(max_test))
+
+
+def _probe_camera(index):
+    """Return the index if a camera opens at it, else None"""
+    cap = cv2.VideoCapture(index, CAMERA_BACKEND)
+    if cap.isOpened():
+        cap.release()
+        return index
+    return None
+
 
 def find_cameras(max_test=10):
     """Find all available cameras"""
-    cameras = []
-    for i in range(max_test):
-        cap = cv2.VideoCapture(i)
-        if cap.isOpened():
-            cameras.append(i)
-            cap.release()
-    return cameras
+    indices = _candidate_indices(max_test)
+    # Opening a device blocks in the driver (with the GIL released), so probe
+    # all indices at once instead of one after another
+    with ThreadPoolExecutor(max_workers=len(indices)) as executor:
+        results = executor.map(_probe_camera, indices)
+    return [index for index in results if index is not None]
 
 
 def capture_from_camera(index):
     """Capture a single frame from camera"""
-    cap = cv2.VideoCapture(index)
+    cap = cv2.VideoCapture(index, CAMERA_BACKEND)
     if not cap.isOpened():
         return None
 
-    # Let camera warm up
-    for _ in range(5):
-        cap.read()
+    # Compressed transfer and a single driver buffer, so the frame retrieved
+    # below is a fresh one rather than a queued stale one
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    # Let camera warm up; grab() skips decoding the discarded frames
+    for _ in range(3):
+        cap.grab()
 
-    ret, frame = cap.read()
+    ret, frame = cap.retrieve() if cap.grab() else (False, None)
     cap.release()
 
-    if ret:
-        # Convert BGR to RGB for matplotlib
-        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    return None
+    # Kept in OpenCV's BGR order; only the display flips it to RGB
+    return frame if ret else None
 
 
 if __name__ == "__main__":
-    print("Searching for cameras...")
-    cameras = find_cameras()
+    parser = argparse.ArgumentParser(description="Test LeKiwi cameras")
+    parser.add_argument(
+        "--cameras",
+        type=str,
+        default=None,
+        help="Comma-separated camera indices to use (e.g. 0,2); skips the scan",
+    )
+    args = parser.parse_args()
+
+    if args.cameras:
+        cameras = [int(index) for index in args.cameras.split(",")]
+    else:
+        print("Searching for cameras...")
+        cameras = find_cameras()
 
     if not cameras:
         print("No cameras found!")
@@ -46,11 +89,13 @@ if __name__ == "__main__":
 
     print(f"Found {len(cameras)} camera(s): {cameras}")
 
-    # Capture from all cameras
+    # Capture from all cameras concurrently, so their warmups overlap
+    print(f"Capturing from camera(s) {cameras}...")
+    with ThreadPoolExecutor(max_workers=len(cameras)) as executor:
+        captured = list(executor.map(capture_from_camera, cameras))
+
     frames = {}
-    for cam_idx in cameras:
-        print(f"Capturing from camera {cam_idx}...")
-        frame = capture_from_camera(cam_idx)
+    for cam_idx, frame in zip(cameras, captured):
         if frame is not None:
             frames[cam_idx] = frame
             print(f"  ✓ Camera {cam_idx}: {frame.shape}")
@@ -67,19 +112,22 @@ if __name__ == "__main__":
         print("\nSaving images...")
         for i, (cam_idx, frame) in enumerate(frames.items(), start=1):
             filename = results_dir / f"camera{i}.png"
-            # Convert RGB back to BGR for OpenCV save
-            frame_bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-            cv2.imwrite(str(filename), frame_bgr)
+            cv2.imwrite(str(filename), frame)
             print(f"  ✓ Saved: {filename}")
         
-        # Display all frames
+        # Display all frames. The OpenCV build is headless (no cv2.imshow), so
+        # matplotlib stays, imported only here so scanning and capture don't
+        # wait on it.
+        import matplotlib.pyplot as plt
+
         num_cameras = len(frames)
         fig, axes = plt.subplots(1, num_cameras, figsize=(6 * num_cameras, 6))
         if num_cameras == 1:
             axes = [axes]
 
         for ax, (cam_idx, frame) in zip(axes, frames.items()):
-            ax.imshow(frame)
+            # BGR -> RGB as a reversed-channel view, without a copy
+            ax.imshow(frame[..., ::-1])
             ax.set_title(f"Camera {cam_idx}", fontsize=14, fontweight="bold")
             ax.axis("off")
 
@@ -1,5 +1,6 @@
 import argparse
 import sys
+import threading
 import time
 from pathlib import Path
 
@@ -9,52 +10,40 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from lekiwi.services.motors import ArmsService, WheelsService
 
 
-def test_arms():
+def test_arms(arms_service: ArmsService):
     """Test ArmsService - play available arm recordings"""
     print("\n=== Testing Arms Service ===")
 
-    arms_service = ArmsService(port=args.port, robot_id=args.id)
-    arms_service.start()
+    print("Getting available arm recordings...")
+    recordings = arms_service.get_available_recordings()
+    print(f"Available: {recordings}")
 
-    try:
-        print("Getting available arm recordings...")
-        recordings = arms_service.get_available_recordings()
-        print(f"Available: {recordings}")
-
-        if recordings:
-            # Play first recording
-            print(f"\nPlaying: {recordings[0]}")
-            arms_service.dispatch("play", recordings[0])
-            time.sleep(3)  # Let it play for a bit
-            print("Arm test completed!")
-        else:
-            print("No arm recordings found.")
-    finally:
-        arms_service.stop()
+    if recordings:
+        # Play first recording
+        print(f"\nPlaying: {recordings[0]}")
+        arms_service.dispatch("play", recordings[0])
+        time.sleep(3)  # Let it play for a bit
+        print("Arm test completed!")
+    else:
+        print("No arm recordings found.")
 
 
-def test_wheels():
+def test_wheels(wheels_service: WheelsService):
     """Test WheelsService - play available wheel recordings"""
     print("\n=== Testing Wheels Service ===")
 
-    wheels_service = WheelsService(port=args.port, robot_id=args.id)
-    wheels_service.start()
+    print("Getting available wheel recordings...")
+    recordings = wheels_service.get_available_recordings()
+    print(f"Available: {recordings}")
 
-    try:
-        print("Getting available wheel recordings...")
-        recordings = wheels_service.get_available_recordings()
-        print(f"Available: {recordings}")
-
-        if recordings:
-            # Play first recording
-            print(f"\nPlaying: {recordings[0]}")
-            wheels_service.dispatch("play", recordings[0])
-            wheels_service.wait_until_idle(timeout=30)
-            print("Wheels test completed!")
-        else:
-            print("No wheel recordings found.")
-    finally:
-        wheels_service.stop()
+    if recordings:
+        # Play first recording
+        print(f"\nPlaying: {recordings[0]}")
+        wheels_service.dispatch("play", recordings[0])
+        wheels_service.wait_until_idle(timeout=30)
+        print("Wheels test completed!")
+    else:
+        print("No wheel recordings found.")
 
 
 if __name__ == "__main__":
@@ -72,10 +61,36 @@ if __name__ == "__main__":
 
     print(f"Testing motors for {args.id} on {args.port}")
 
-    if args.test in ["arms", "both"]:
-        test_arms()
-
-    if args.test in ["wheels", "both"]:
-        test_wheels()
+    # Connect one service at a time: both share the serial bus, and each
+    # connect() writes the motor configuration
+    services = []
+    tests = []
+    try:
+        if args.test in ["arms", "both"]:
+            arms_service = ArmsService(port=args.port, robot_id=args.id)
+            arms_service.start()
+            services.append(arms_service)
+            tests.append((test_arms, arms_service))
+        if args.test in ["wheels", "both"]:
+            wheels_service = WheelsService(port=args.port, robot_id=args.id)
+            wheels_service.start()
+            services.append(wheels_service)
+            tests.append((test_wheels, wheels_service))
+
+        # Playback mostly waits, so run it side by side, the same way the agent
+        # runs the arms and wheels services
+        threads = [
+            threading.Thread(target=test, args=(service,), name=test.__name__)
+            for test, service in tests
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        # Stop only after every playback has finished: ArmsService.stop()
+        # disconnects the whole bus, base motors included
+        for service in reversed(services):
+            service.stop()
 
     print("\n✓ Motor tests completed!")